@@ -4,7 +4,9 @@
 # generated by wxGlade 0.9.3 on Fri May 24 15:04:37 2019
 #
 
+import logging
 import wx
+import tools
 
 # begin wxGlade: dependencies
 # end wxGlade
@@ -199,5 +201,7 @@ class MyApp(wx.App):
 
 
 if __name__ == "__main__":
+    # debug messages from the socket modules are printed in the same format as tools.println()
+    logging.basicConfig(format=tools.LOG_FORMAT, datefmt=tools.LOG_DATE_FORMAT)
     app = MyApp(0)
     app.MainLoop()
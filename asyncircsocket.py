@@ -0,0 +1,262 @@
+#!/usr/bin/env python
+import asyncio
+import logging
+import re
+import tools
+from ircsocket import (ENCODING, DECODING_ERRORS, LINE_ENDINGS, CONNECTION_TIMEOUT, RECV_TIMEOUT, SEND_TIMEOUT,
+                       MAX_RECV_BYTES, SocketTimeout, SocketConnectFailed, SocketConnectionBroken,
+                       SocketConnectionNotEstablished, SocketAlreadyConnected)
+
+try:
+    import uvloop  # Optional -- a faster, libuv-based drop-in replacement for the asyncio event loop
+except ImportError:
+    uvloop = None
+
+DEBUG_MODE = False  # Allows printing of socket debug messages (enables DEBUG on the module logger)
+
+# NOTE: Debug messages go through logging, which skips formatting them unless the DEBUG level is enabled
+_log = logging.getLogger(__name__)
+_log.addHandler(logging.NullHandler())
+
+# NOTE: A module-level handler makes DEBUG_MODE print even when the application hasn't configured logging, and the
+# records stop here so they aren't printed a second time by a handler on the root logger
+if DEBUG_MODE:
+    _log.addHandler(tools.make_log_handler())
+    _log.setLevel(logging.DEBUG)
+    _log.propagate = False
+
+_ENCODED_LINE_ENDINGS = LINE_ENDINGS.encode(ENCODING)
+_PING_PATTERN = re.compile(rb'^PING +(\S+)')  # Matches a server PING line and captures the token to echo
+
+# NOTE: Error messages that only depend on the constants above are built once instead of on every failure
+_SEND_TIMEOUT_MESSAGE = 'Send failed: Operation timed out after {} second(s).'.format(SEND_TIMEOUT)
+_RECV_TIMEOUT_MESSAGE = 'Receive failed: Operation timed out after {} second(s).'.format(RECV_TIMEOUT)
+_LINE_TOO_LONG_MESSAGE = 'Receive failed: Line exceeded {} bytes.'.format(MAX_RECV_BYTES)
+
+
+def run(coro):
+    """Run a coroutine to completion on a new event loop, using uvloop if it is installed.
+
+    Args:
+        coro -- The coroutine to run, e.g. the client's main() coroutine.
+
+    Returns:
+        The value returned by the coroutine.
+    """
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+class AsyncIrcSocket:
+    """An asyncio version of IrcSocket, so a single thread can service many IRC connections.
+
+    Attributes:
+        _reader -- asyncio StreamReader for the connection to the IRC server.
+        _writer -- asyncio StreamWriter for the connection to the IRC server.
+        _is_connected -- Boolean value used to keep track of whether the connection is active at any given time.
+
+    Methods:
+        __init__() -- Initialize the connection status, but don't do anything else.
+        connect(host, port) -- Initialize a connection to an IRC server. Takes two arguments. (coroutine)
+        disconnect() -- Close the connection. (coroutine)
+        send_raw_text(raw_text) -- Encode and send a string to the IRC server. Takes one argument. (coroutine)
+        recv_raw_text() -- Receive and decode one line from the IRC server. (coroutine)
+        is_connected() -- Return the connection status of the socket.
+        _send_encoded(encoded_msg) -- Send already-encoded data to the IRC server. Takes one argument. (coroutine)
+
+    Exceptions:
+        The same exceptions as IrcSocket, imported from the ircsocket module.
+    """
+    __slots__ = ('_reader', '_writer', '_is_connected')
+
+    def __init__(self):
+        """Initialize the connection status, but don't do anything else."""
+        self._reader = None
+        self._writer = None
+        self._is_connected = False
+
+    async def connect(self, host, port):
+        """Initialize a connection to an IRC server.
+
+        Args:
+            host -- The hostname or IP address of the IRC server.
+            port -- The port to use when attempting to connect.
+
+        Raises:
+            SocketConnectFailed
+            SocketTimeout
+            SocketAlreadyConnected
+        """
+        if not self.is_connected():
+            _log.debug('Connecting to %s:%s...', host, port)
+
+            try:
+                self._reader, self._writer = await asyncio.wait_for(
+                    asyncio.open_connection(host, port, limit=MAX_RECV_BYTES), CONNECTION_TIMEOUT)
+
+            except asyncio.TimeoutError as err:
+                error_message = 'Connection failed: Operation timed out'
+                tools.println(error_message, tools.SEVERITY['ERROR'])
+                raise SocketTimeout(error_message) from err
+
+            except OSError as err:
+                error_message = 'Connection failed: {}'.format(err)
+                tools.println(error_message, tools.SEVERITY['ERROR'])
+                raise SocketConnectFailed(error_message) from err
+
+            else:
+                _log.debug('Connection successful.')
+                self._is_connected = True
+
+        else:
+            error_message = 'Connection failed: Socket is already connected to something.'
+            tools.println(error_message, tools.SEVERITY['ERROR'])
+            raise SocketAlreadyConnected(error_message)
+
+    async def disconnect(self):
+        """Close the connection."""
+        _log.debug('Shutting down the connection...')
+        self._is_connected = False
+
+        if self._writer is not None:
+            self._writer.close()
+
+            # NOTE: wait_closed() only exists on Python 3.7+
+            if hasattr(self._writer, 'wait_closed'):
+                try:
+                    await self._writer.wait_closed()
+
+                except OSError as err:
+                    error_message = 'Shutdown failed: {}'.format(err)
+                    tools.println(error_message, tools.SEVERITY['WARN'])
+
+            self._reader = None
+            self._writer = None
+
+    async def send_raw_text(self, raw_text):
+        """Encode and send a string to the IRC server. The encoding method is the value of ENCODING.
+
+        Args:
+            raw_text -- The string to be sent. If it is an empty string, then this method will do nothing.
+
+        Raises:
+            SocketTimeout
+            SocketConnectionBroken
+            SocketConnectionNotEstablished
+        """
+        if not raw_text:
+            return
+
+        if self.is_connected():
+            await self._send_encoded(raw_text.encode(ENCODING) + _ENCODED_LINE_ENDINGS)
+
+        else:
+            error_message = 'Send failed: Connection has not been established.'
+            tools.println(error_message, tools.SEVERITY['ERROR'])
+            raise SocketConnectionNotEstablished(error_message)
+
+    async def recv_raw_text(self):
+        """Receive and decode one line from the IRC server. The decoding method is the value of ENCODING.
+
+        PING messages are answered automatically, but are still returned to the caller.
+
+        Raises:
+            SocketTimeout
+            SocketConnectionBroken
+            SocketConnectionNotEstablished
+
+        Returns:
+            str -- The line of text received from the IRC server, without its line ending.
+        """
+        if self.is_connected():
+            try:
+                encoded_msg = await asyncio.wait_for(self._reader.readuntil(_ENCODED_LINE_ENDINGS), RECV_TIMEOUT)
+
+            except asyncio.TimeoutError as err:
+                error_message = _RECV_TIMEOUT_MESSAGE
+                tools.println(error_message, tools.SEVERITY['ERROR'])
+                raise SocketTimeout(error_message) from err
+
+            except asyncio.IncompleteReadError as err:
+                error_message = 'Receive failed: Connection was closed unexpectedly.'
+                tools.println(error_message, tools.SEVERITY['ERROR'])
+                self._is_connected = False
+                raise SocketConnectionBroken(error_message) from err
+
+            except asyncio.LimitOverrunError as err:
+                error_message = _LINE_TOO_LONG_MESSAGE
+                tools.println(error_message, tools.SEVERITY['ERROR'])
+                self._is_connected = False
+                raise SocketConnectionBroken(error_message) from err
+
+            except OSError as err:
+                error_message = 'Receive failed: {}'.format(err)
+                tools.println(error_message, tools.SEVERITY['ERROR'])
+                self._is_connected = False
+                raise SocketConnectionBroken(error_message) from err
+
+            encoded_msg = encoded_msg[:-len(_ENCODED_LINE_ENDINGS)]
+
+            # NOTE: We have to echo the server's "PING <a string>" messages with "PONG <same string>"
+            ping = _PING_PATTERN.match(encoded_msg)
+
+            if ping is not None:
+                await self._send_encoded(b'PONG ' + ping.group(1) + _ENCODED_LINE_ENDINGS)
+
+            raw_text = str(encoded_msg, ENCODING, DECODING_ERRORS)
+
+            _log.debug('<< RECV / %s Bytes: %s', len(encoded_msg), raw_text)
+
+            return raw_text
+
+        else:
+            error_message = 'Receive failed: Connection has not been established.'
+            tools.println(error_message, tools.SEVERITY['ERROR'])
+            raise SocketConnectionNotEstablished(error_message)
+
+    def is_connected(self):
+        """Return the connection status of the socket.
+
+        Returns:
+            bool -- True if connection is active. False if connection is inactive.
+        """
+        return self._is_connected
+
+    async def _send_encoded(self, encoded_msg):
+        """Send already-encoded data to the IRC server.
+
+        Args:
+            encoded_msg -- The bytes to be sent, including line endings.
+
+        Raises:
+            SocketTimeout
+            SocketConnectionBroken
+        """
+        # NOTE: drain() waits until the transport's buffer is flushed, replacing the manual send() retry loop
+        try:
+            self._writer.write(encoded_msg)
+            await asyncio.wait_for(self._writer.drain(), SEND_TIMEOUT)
+
+        except asyncio.TimeoutError as err:
+            error_message = _SEND_TIMEOUT_MESSAGE
+            tools.println(error_message, tools.SEVERITY['ERROR'])
+            raise SocketTimeout(error_message) from err
+
+        except OSError as err:
+            error_message = 'Send failed: {}'.format(err)
+            tools.println(error_message, tools.SEVERITY['ERROR'])
+            self._is_connected = False
+            raise SocketConnectionBroken(error_message) from err
+
+        if _log.isEnabledFor(logging.DEBUG):
+            raw_text = encoded_msg[:-len(_ENCODED_LINE_ENDINGS)].decode(ENCODING, 'replace')
+            _log.debug('>> SENT / %s Bytes: %s', len(encoded_msg), raw_text)
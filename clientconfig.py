@@ -1,5 +1,8 @@
 #!/usr/bin/env python
+import configparser
 import os.path
+import sys
+from collections import OrderedDict
 import config
 import tools
 
@@ -11,28 +14,96 @@ DEFAULT_LOG_PATH = './logs/server.log'  # Default path to the IRC log file
 DEBUG_MODE = False                      # Allows printing of socket debug messages
 
 
+# (accessor name, section, key, default value) for every value stored in the client configuration
+FIELDS = [
+    ('nickname', 'IDENTITY', 'nickname', ''),
+    ('username', 'IDENTITY', 'username', ''),
+    ('realname', 'IDENTITY', 'realname', ''),
+    ('nickservpass', 'IDENTITY', 'nickserv_password', ''),
+    ('serveraddress', 'CONNECTION', 'server_address', ''),
+    ('serverport', 'CONNECTION', 'server_port', DEFAULT_PORT),
+    ('serverpass', 'CONNECTION', 'server_password', ''),
+    ('autoreconnect', 'CONNECTION', 'auto_reconnect', DEFAULT_AUTO_RECONNECT),
+    ('enablelogging', 'CONNECTION', 'enable_logging', DEFAULT_ENABLE_LOGGING),
+    ('autojoinchans', 'CONNECTION', 'autojoin_channels', ''),
+    ('configfile', 'PATHS', 'config_file', DEFAULT_CONFIG_PATH),
+    ('logfile', 'PATHS', 'log_file', DEFAULT_LOG_PATH)
+]
+
+
+class _ConfigField:
+    # data descriptor that reads and writes one key of a ClientConfig directly in its configparser
+    # (the section and key are interned so the lookups in the configparser's dicts can compare by identity)
+    def __init__(self, section, key, default):
+        self.section = sys.intern(section)
+        self.key = sys.intern(key)
+        self.default = default
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        return instance._read_option(self.section, self.key, self.default)
+
+    def __set__(self, instance, value):
+        instance._config[self.section][self.key] = str(value)
+
+
+def _group_defaults(fields):
+    # groups the field defaults by section -- {section: {key: default value}}
+    defaults = OrderedDict()
+
+    for name, section, key, default in fields:
+        defaults.setdefault(sys.intern(section), OrderedDict())[sys.intern(key)] = default
+
+    return defaults
+
+
+def _make_accessors(name, field):
+    # builds the get_<name>() and set_<name>() methods for a field
+    def getter(self):
+        return field.__get__(self, type(self))
+
+    def setter(self, value):
+        return self.add_key(field.section, field.key, str(value))
+
+    getter.__name__ = 'get_' + name
+    getter.__qualname__ = 'ClientConfig.' + getter.__name__
+    setter.__name__ = 'set_' + name
+    setter.__qualname__ = 'ClientConfig.' + setter.__name__
+    return getter, setter
+
+
 class ClientConfig(config.Config):
+    __slots__ = ()
+
+    # default key/value pairs -- these are only written into the configparser when the file is saved
+    _DEFAULTS = _group_defaults(FIELDS)
+
     def __init__(self, filename=DEFAULT_CONFIG_PATH):
         super().__init__(filename)
 
-        # initialize default key/value pairs
-        self.add_section('IDENTITY')
-        self.add_key('IDENTITY', 'nickname', '')
-        self.add_key('IDENTITY', 'username', '')
-        self.add_key('IDENTITY', 'realname', '')
-        self.add_key('IDENTITY', 'nickserv_password', '')
-
-        self.add_section('CONNECTION')
-        self.add_key('CONNECTION', 'server_address', '')
-        self.add_key('CONNECTION', 'server_port', DEFAULT_PORT)
-        self.add_key('CONNECTION', 'server_password', '')
-        self.add_key('CONNECTION', 'auto_reconnect', DEFAULT_AUTO_RECONNECT)
-        self.add_key('CONNECTION', 'enable_logging', DEFAULT_ENABLE_LOGGING)
-        self.add_key('CONNECTION', 'autojoin_channels', '')
-
-        self.add_section('PATHS')
-        self.add_key('PATHS', 'config_file', DEFAULT_CONFIG_PATH)
-        self.add_key('PATHS', 'log_file', DEFAULT_LOG_PATH)
+        # initialize the sections straight into the configparser's storage, skipping add_section()'s validation
+        # -- their keys fall back to _DEFAULTS until they are set or loaded
+        for section in self._DEFAULTS:
+            self._config._sections[section] = self._config._dict()
+            self._config._proxies[section] = configparser.SectionProxy(self._config, section)
+
+    def get_key(self, section, key, default=''):
+        # retrieves a key/value pair, falling back to the default value if it hasn't been set or loaded
+        return super().get_key(section, key, self._DEFAULTS.get(section, {}).get(key, default))
+
+    def save_to_file(self):
+        # writes through any default values that haven't been set, so the file always has every key
+        for section, options in self._DEFAULTS.items():
+            if not self._config.has_section(section):
+                self.add_section(section)
+
+            for key, value in options.items():
+                if not self._config.has_option(section, key):
+                    self.add_key(section, key, value)
+
+        return super().save_to_file()
 
     def save_client_config(self):
         # save existing configuration to a file
@@ -87,98 +158,15 @@ class ClientConfig(config.Config):
             # successfully loaded configuration from file
             tools.println('Load succeeded.')
 
-    def get_nickname(self):
-        # return the value of 'nickname' stored in the IDENTITY section
-        return str(self.get_key('IDENTITY', 'nickname'))
-
-    def get_username(self):
-        # return the value of 'username' stored in the IDENTITY section
-        return str(self.get_key('IDENTITY', 'username'))
-
-    def get_realname(self):
-        # return the value of 'realname' stored in the IDENTITY section
-        return str(self.get_key('IDENTITY', 'realname'))
-
-    def get_nickservpass(self):
-        # return the value of 'nickserv_password' stored in the IDENTITY section
-        return str(self.get_key('IDENTITY', 'nickserv_password'))
-
-    def get_serveraddress(self):
-        # return the value of 'server_address' stored in the CONNECTION section
-        return str(self.get_key('CONNECTION', 'server_address'))
-
-    def get_serverport(self):
-        # return the value of 'server_port' stored in the CONNECTION section
-        return str(self.get_key('CONNECTION', 'server_port'))
-
-    def get_serverpass(self):
-        # return the value of 'server_password' stored in the CONNECTION section
-        return str(self.get_key('CONNECTION', 'server_password'))
-
-    def get_autoreconnect(self):
-        # return the value of 'auto_reconnect' stored in the CONNECTION section
-        return str(self.get_key('CONNECTION', 'auto_reconnect'))
-
-    def get_enablelogging(self):
-        # return the value of 'enable_logging' stored in the CONNECTION section
-        return str(self.get_key('CONNECTION', 'enable_logging'))
-
-    def get_autojoinchans(self):
-        # return the value of 'autojoin_channels' stored in the CONNECTION section
-        return str(self.get_key('CONNECTION', 'autojoin_channels'))
-
-    def get_configfile(self):
-        # return the value of 'config_file' stored in the PATHS section
-        return str(self.get_key('PATHS', 'config_file'))
-
-    def get_logfile(self):
-        # return the value of 'log_file' stored in the PATHS section
-        return str(self.get_key('PATHS', 'log_file'))
-
-    def set_nickname(self, nickname):
-        # sets the value of 'nickname'
-        return self.add_key('IDENTITY', 'nickname', str(nickname))
-
-    def set_username(self, username):
-        # sets the value of 'username'
-        return self.add_key('IDENTITY', 'username', str(username))
-
-    def set_realname(self, realname):
-        # sets the value of 'realname'
-        return self.add_key('IDENTITY', 'realname', str(realname))
-
-    def set_nickservpass(self, nickserv_password):
-        # sets the value of 'nickserv_password'
-        return self.add_key('IDENTITY', 'nickserv_password', str(nickserv_password))
-
-    def set_serveraddress(self, server_address):
-        # sets the value of 'server_address'
-        return self.add_key('CONNECTION', 'server_address', str(server_address))
-
-    def set_serverport(self, server_port):
-        # sets the value of 'server_port'
-        return self.add_key('CONNECTION', 'server_port', str(server_port))
-
-    def set_serverpass(self, server_password):
-        # sets the value of 'server_password'
-        return self.add_key('CONNECTION', 'server_password', str(server_password))
-
-    def set_autoreconnect(self, auto_reconnect):
-        # sets the value of 'auto_reconnect'
-        return self.add_key('CONNECTION', 'auto_reconnect', str(auto_reconnect))
 
-    def set_enablelogging(self, enable_logging):
-        # sets the value of 'enable_logging'
-        return self.add_key('CONNECTION', 'enable_logging', str(enable_logging))
+def _install_fields(cls, fields):
+    # attaches a descriptor plus the get_*/set_* methods for every field to the class
+    for name, section, key, default in fields:
+        field = _ConfigField(section, key, default)
+        setattr(cls, key, field)
 
-    def set_autojoinchans(self, autojoin_channels):
-        # sets the value of 'autojoin_channels'
-        return self.add_key('CONNECTION', 'autojoin_channels', str(autojoin_channels))
+        for accessor in _make_accessors(name, field):
+            setattr(cls, accessor.__name__, accessor)
 
-    def set_configfile(self, config_file):
-        # sets the value of 'config_file'
-        return self.add_key('PATHS', 'config_file', str(config_file))
 
-    def set_logfile(self, log_file):
-        # sets the value of 'log_file'
-        return self.add_key('PATHS', 'log_file', str(log_file))
+_install_fields(ClientConfig, FIELDS)
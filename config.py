@@ -1,8 +1,15 @@
 #!/usr/bin/env python
 import configparser
+import os.path
+import sys
+
+# Parsed configuration files keyed by absolute path: (st_mtime_ns, st_size, sections)
+_PARSE_CACHE = {}
 
 
 class Config:
+    __slots__ = ('_filename', '_config')
+
     def __init__(self, filename=''):
         self._filename = filename
         self._config = configparser.ConfigParser()
@@ -18,10 +25,15 @@ class Config:
     def save_to_file(self):
         # saves the configuration to a file
         try:
-            # file saved successfully -- return 1
             with open(self._filename, 'w') as configfile:
                 self._config.write(configfile)
-                return 1
+
+            # file saved successfully -- remember what was written so loading it back doesn't re-parse it
+            if not self._config.defaults():
+                sections = {section: list(options.items()) for section, options in self._config._sections.items()}
+                self._cache_sections(sections)
+
+            return 1
         except IOError:
             # there was an error saving the file -- return 0
             return 0
@@ -29,14 +41,106 @@ class Config:
     def load_from_file(self):
         # loads a configuration from an existing file
         try:
-            # file loaded successfully -- return 1
+            # reuse the previous parse if the file hasn't changed since it was cached
+            path = os.path.abspath(self._filename)
+            stat = os.stat(path)
+            cached = _PARSE_CACHE.get(path)
+
+            if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                self._merge_sections(cached[2])
+                return 1
+
             with open(self._filename, 'r') as configfile:
-                self._config.read_file(configfile)
+                text = configfile.read()
+
+            sections = self._fast_read(text)
+
+            if sections is None:
+                # the file uses syntax the fast path doesn't handle -- let configparser parse it
+                self._config.read_string(text, source=self._filename)
+            else:
+                # cache under the stat taken before reading -- if the file changed since, the next load just re-parses
+                self._cache_sections(sections, stat)
+                self._merge_sections(sections)
+
+            # file loaded successfully -- return 1
             return 1
         except IOError:
             # there was an error loading the file -- return 0
             return 0
 
+    def _fast_read(self, text):
+        # parses the simple 'key = value' layout written by save_to_file without going through configparser's
+        # general-purpose parser -- returns None if anything unusual is found, otherwise the parsed sections
+        sections = {}
+        section = None
+        seen = None
+
+        # split on '\n' only, like configparser -- splitlines() would also split on characters such as '\x0c' or '\x85'
+        for line in text.split('\n'):
+            if line.endswith('\r'):
+                line = line[:-1]
+
+            if not line.strip():
+                continue
+
+            if line[0] in ' \t#;':
+                # continuation lines and comments need the full parser
+                return None
+
+            if line[0] == '[':
+                line = line.rstrip()
+
+                if line[-1] != ']':
+                    return None
+
+                section = line[1:-1]
+
+                if not section or section == configparser.DEFAULTSECT or section in sections:
+                    return None
+
+                sections[section] = []
+                seen = set()
+
+            else:
+                key, sep, value = line.partition('=')
+
+                if section is None or not sep or ':' in key:
+                    return None
+
+                key = self._config.optionxform(key.strip())
+
+                # empty and duplicate keys are errors that configparser should report
+                if not key or key in seen:
+                    return None
+
+                seen.add(key)
+                sections[section].append((sys.intern(key), value.strip()))
+
+        return sections
+
+    def _merge_sections(self, sections):
+        # loads parsed sections straight into the configparser's storage
+        for section, options in sections.items():
+            if not self._config.has_section(section):
+                self._config.add_section(section)
+
+            self._config._sections[section].update(options)
+
+    def _cache_sections(self, sections, stat=None):
+        # stores parsed sections for the current file, stamped with its modification time and size
+        # (stat should come from before the file was read -- it is only taken here when none is given)
+        path = os.path.abspath(self._filename)
+
+        if stat is None:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                _PARSE_CACHE.pop(path, None)
+                return
+
+        _PARSE_CACHE[path] = (stat.st_mtime_ns, stat.st_size, sections)
+
     def add_section(self, section):
         # adds a new section to the configparser
         try:
@@ -55,19 +159,41 @@ class Config:
 
     def remove_key(self, section, key):
         # removes a key/value pair from the specified section header
+        options = self._config._sections.get(section)
+
+        if options is None or self._config.optionxform(key) not in options:
+            # nothing to remove -- skip setting up the exception handler
+            return 0
+
         try:
-            self.remove_key(section, key)
-            return 1
+            return int(self._config.remove_option(section, key))
         except configparser.Error:
             return 0
 
-    def get_key(self, section, key):
-        # retrieves a key/value pair from the specified section header
-        try:
-            value = self._config[section][key]
+    def get_key(self, section, key, default=''):
+        # retrieves a key/value pair from the specified section header -- returns default if it doesn't exist
+        return self._read_option(section, self._config.optionxform(key), default)
+
+    def _read_option(self, section, option, default):
+        # reads a value whose key has already been through optionxform -- plain values come straight from the
+        # section dict, while values that need interpolation or a [DEFAULT] fallback still go through configparser
+        options = self._config._sections.get(section)
+
+        if options is None:
+            return default
+
+        value = options.get(option)
+
+        if value is None:
+            if not self._config._defaults:
+                return default
+        elif '%' not in value:
             return value
+
+        try:
+            return self._config.get(section, option, fallback=default)
         except configparser.Error:
-            return 0
+            return default
 
     def get_sections(self):
         # retrieves a list of all the sections in the configparser object
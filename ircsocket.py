@@ -1,22 +1,67 @@
 #!/usr/bin/env python
+import logging
+import re
+import selectors
 import socket
+import threading
+import time
 import tools
 
-ENCODING = 'UTF-8'       # The method for encoding and decoding all messages (UTF-8 allows 4 bytes max per char)
-LINE_ENDINGS = '\r\n'    # This is appended to all messages sent by the socket (should always be CRLF)
-CONNECTION_TIMEOUT = 30  # The socket will timeout after this many seconds when trying to initialize the connection
-RECV_TIMEOUT = 180       # The socket will timeout after this many seconds when trying to receive data
-SEND_TIMEOUT = 30        # The socket will timeout after this many seconds when trying to send data
-MAX_RECV_BYTES = 4096    # The maximum amount of bytes to be received by the socket at a time
-DEBUG_MODE = False       # Allows printing of socket debug messages
+ENCODING = 'UTF-8'           # The method for encoding and decoding all messages (UTF-8 allows 4 bytes max per char)
+DECODING_ERRORS = 'replace'  # Received bytes that are not valid in ENCODING are replaced rather than raising an error
+LINE_ENDINGS = '\r\n'        # This is appended to all messages sent by the socket (should always be CRLF)
+CONNECTION_TIMEOUT = 30      # The socket will timeout after this many seconds when trying to initialize the connection
+RECV_TIMEOUT = 180           # The socket will timeout after this many seconds when trying to receive data
+SEND_TIMEOUT = 30            # The socket will timeout after this many seconds when trying to send data
+MAX_RECV_BYTES = 65536       # The maximum amount of bytes to be received by the socket at a time
+SEND_COALESCE_BYTES = 1400   # Queued outgoing messages are sent once this many bytes are waiting (about one packet)
+RECV_BUFFER_SIZE = 262144    # The size in bytes requested for the kernel's receive buffer (SO_RCVBUF)
+SEND_BUFFER_SIZE = 65536     # The size in bytes requested for the kernel's send buffer (SO_SNDBUF)
+KEEPALIVE_IDLE = 60          # Seconds a connection may sit idle before keepalive probes start (where supported)
+KEEPALIVE_INTERVAL = 15      # Seconds between keepalive probes once they have started (where supported)
+KEEPALIVE_COUNT = 4          # Unanswered keepalive probes before the connection is dropped (where supported)
+DEBUG_MODE = False           # Allows printing of socket debug messages (enables DEBUG on the module logger)
+
+# NOTE: Debug messages go through logging, which skips formatting them unless the DEBUG level is enabled
+_log = logging.getLogger(__name__)
+_log.addHandler(logging.NullHandler())
+
+# NOTE: A module-level handler makes DEBUG_MODE print even when the application hasn't configured logging, and the
+# records stop here so they aren't printed a second time by a handler on the root logger
+if DEBUG_MODE:
+    _log.addHandler(tools.make_log_handler())
+    _log.setLevel(logging.DEBUG)
+    _log.propagate = False
+
+_ENCODED_LINE_ENDINGS = LINE_ENDINGS.encode(ENCODING)
+_PING_PATTERN = re.compile(rb'^PING +(\S+)', re.MULTILINE)  # Matches server PINGs and captures the token to echo
+_HAS_SENDMSG = hasattr(socket.socket, 'sendmsg')  # Scatter-gather sends are not available on every platform
+_MAX_SENDMSG_BUFFERS = 1024  # The most buffers handed to a single sendmsg() call (the common IOV_MAX)
+
+# NOTE: Error messages that only depend on the constants above are built once instead of on every failure
+_SEND_TIMEOUT_MESSAGE = 'Send failed: Operation timed out after {} second(s).'.format(SEND_TIMEOUT)
+_RECV_TIMEOUT_MESSAGE = 'Receive failed: Operation timed out after {} second(s).'.format(RECV_TIMEOUT)
+_LINE_TOO_LONG_MESSAGE = 'Receive failed: Line exceeded {} bytes.'.format(MAX_RECV_BYTES)
 
 
 class IrcSocket:
     """An abstraction of the base Python socket class, tailored specifically for IRC connections.
 
+    Sending is thread-safe: one thread can wait in recv_raw_text() while other threads send or queue messages. Receiving
+    should only be done by one thread at a time, and connect(), disconnect() and reset() should not overlap other calls.
+
     Attributes:
         _socket -- Python socket object used for communicating back and forth with an IRC server.
+        _current_timeout -- The timeout most recently set on _socket (None until one is set).
+        _recv_selector -- Selector that waits for _socket to become readable once it is connected (None until then).
+        _send_selector -- Selector that waits for _socket to become writable once it is connected (None until then).
         _is_connected -- Boolean value used to keep track of whether the connection is active at any given time.
+        _send_queue -- Encoded messages (one bytes object each) queued by queue_raw_text() that have not been sent yet.
+        _send_queue_bytes -- The total length of the messages in _send_queue.
+        _send_lock -- Lock held while _send_queue is changed or data is sent, so several threads can send safely.
+        _recv_buf -- Received bytes that have not yet formed a complete line (a line may not exceed MAX_RECV_BYTES).
+        _recv_scratch -- Preallocated buffer that the socket receives into (MAX_RECV_BYTES long).
+        _recv_view -- A memoryview over _recv_scratch, so received data can be sliced without copying.
 
     Methods:
         __init__() -- Initialize a socket and its connection status, but don't do anything else.
@@ -24,8 +69,18 @@ class IrcSocket:
         disconnect() -- Shutdown and close the socket.
         reset() -- Shutdown, close, and then re-initialize the socket so it can connect again.
         send_raw_text(raw_text) -- Encode and send a string to the IRC server. Takes one argument.
+        send_many(lines) -- Encode and send several strings to the IRC server at once. Takes one argument.
+        queue_raw_text(raw_text) -- Encode a string and queue it to be sent with other messages. Takes one argument.
+        flush() -- Send any queued messages to the IRC server right away.
         recv_raw_text() -- Receive and decode data from the IRC server.
+        recv_raw_lines() -- Receive data from the IRC server without decoding it.
+        decode_line(line) -- Decode a line returned by recv_raw_lines(). Takes one argument.
         is_connected() -- Return the connection status of the socket.
+        _recv_lines(decode) -- Receive data, answer any PINGs, and split off the complete lines. Takes one argument.
+        _send_encoded(encoded_msg) -- Send already-encoded data to the IRC server. Takes one argument.
+        _send_frames(frames) -- Send encoded messages on the non-blocking socket, in order. Takes one argument.
+        _wait_for(selector, timeout) -- Wait until one of the socket's selectors is ready. Takes two arguments.
+        _create_socket() -- Create a TCP socket tuned for IRC traffic.
         _set_timeout(new_timeout) -- Set the socket object's timeout in seconds. Takes one argument.
 
     Exceptions:
@@ -36,10 +91,22 @@ class IrcSocket:
         SocketConnectionNotEstablished -- Disconnected socket attempts an action that requires an active connection.
         SocketAlreadyConnected -- The socket is already connected but tries to initialize a new connection.
     """
+    __slots__ = ('_socket', '_current_timeout', '_recv_selector', '_send_selector', '_is_connected', '_send_queue',
+                 '_send_queue_bytes', '_send_lock', '_recv_buf', '_recv_scratch', '_recv_view')
+
     def __init__(self):
         """Initialize a socket and its connection status, but don't do anything else."""
-        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket = self._create_socket()
+        self._current_timeout = None
+        self._recv_selector = None
+        self._send_selector = None
         self._is_connected = False
+        self._send_queue = []
+        self._send_queue_bytes = 0
+        self._send_lock = threading.RLock()
+        self._recv_buf = bytearray()
+        self._recv_scratch = bytearray(MAX_RECV_BYTES)
+        self._recv_view = memoryview(self._recv_scratch)
 
     def connect(self, host, port):
         """Initialize a connection to an IRC server.
@@ -55,33 +122,34 @@ class IrcSocket:
         """
         if not self.is_connected():
             self._set_timeout(CONNECTION_TIMEOUT)
-            tools.println('Connecting to {}:{}...'.format(host, port), tools.SEVERITY['DEBUG'], DEBUG_MODE)
+            _log.debug('Connecting to %s:%s...', host, port)
 
             try:
                 self._socket.connect((host, port))
 
-            except socket.herror as err:
-                error_message = 'Connection failed: {}'.format(err)
-                tools.println(error_message, tools.SEVERITY['ERROR'])
-                raise SocketConnectFailed(error_message)
-
-            except socket.gaierror as err:
-                error_message = 'Connection failed: {}'.format(err)
-                tools.println(error_message, tools.SEVERITY['ERROR'])
-                raise SocketConnectFailed(error_message)
-
-            except socket.timeout:
+            except socket.timeout as err:
                 error_message = 'Connection failed: Operation timed out'
                 tools.println(error_message, tools.SEVERITY['ERROR'])
-                raise SocketTimeout(error_message)
+                raise SocketTimeout(error_message) from err
 
-            except socket.error as err:
+            # NOTE: socket.herror and socket.gaierror are subclasses of OSError, so this also covers lookup failures
+            except OSError as err:
                 error_message = 'Connection failed: {}'.format(err)
                 tools.println(error_message, tools.SEVERITY['ERROR'])
-                raise SocketConnectFailed(error_message)
+                raise SocketConnectFailed(error_message) from err
 
             else:
-                tools.println('Connection successful.', tools.SEVERITY['DEBUG'], DEBUG_MODE)
+                _log.debug('Connection successful.')
+
+                # NOTE: From here on the socket is non-blocking, and RECV_TIMEOUT/SEND_TIMEOUT are enforced by waiting on
+                # a selector only when an operation would block, instead of by settimeout() before every operation.
+                # Each direction has its own selector, registered once, so a thread waiting to receive and a thread
+                # waiting to send never change each other's registration.
+                self._set_timeout(0.0)
+                self._recv_selector = selectors.DefaultSelector()
+                self._recv_selector.register(self._socket, selectors.EVENT_READ)
+                self._send_selector = selectors.DefaultSelector()
+                self._send_selector.register(self._socket, selectors.EVENT_WRITE)
                 self._is_connected = True
 
         else:
@@ -91,7 +159,15 @@ class IrcSocket:
 
     def disconnect(self):
         """Shutdown and close the socket."""
-        tools.println('Shutting down the connection...', tools.SEVERITY['DEBUG'], DEBUG_MODE)
+        _log.debug('Shutting down the connection...')
+
+        # NOTE: Give any queued messages (e.g. a QUIT) a last chance to go out before the connection is closed
+        if self._send_queue and self.is_connected():
+            try:
+                self.flush()
+            except SocketError:
+                pass
+
         self._is_connected = False
 
         try:
@@ -102,15 +178,29 @@ class IrcSocket:
             tools.println(error_message, tools.SEVERITY['WARN'])
 
         finally:
-            tools.println('Cleaning up.', tools.SEVERITY['DEBUG'], DEBUG_MODE)
+            _log.debug('Cleaning up.')
+
+            if self._recv_selector is not None:
+                self._recv_selector.close()
+                self._send_selector.close()
+                self._recv_selector = None
+                self._send_selector = None
+
             self._socket.close()
 
     def reset(self):
         """Shutdown, close, and then re-initialize the socket so it can connect again."""
-        tools.println('Resetting socket...', tools.SEVERITY['DEBUG'], DEBUG_MODE)
+        _log.debug('Resetting socket...')
         self.disconnect()
-        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        tools.println('Socket reset.', tools.SEVERITY['DEBUG'], DEBUG_MODE)
+        self._socket = self._create_socket()
+        self._current_timeout = None
+
+        with self._send_lock:
+            del self._send_queue[:]
+            self._send_queue_bytes = 0
+
+        del self._recv_buf[:]
+        _log.debug('Socket reset.')
 
     def send_raw_text(self, raw_text):
         """Encode and send a string to the IRC server. The encoding method is the value of ENCODING.
@@ -123,108 +213,345 @@ class IrcSocket:
             SocketConnectionBroken
             SocketConnectionNotEstablished
         """
+        if not raw_text:
+            return
+
         if self.is_connected():
-            if raw_text != '':
-                encoded_msg = '{}{}'.format(raw_text, LINE_ENDINGS).encode(ENCODING)
-                msg_len = len(encoded_msg)
-                bytes_sent = 0
+            self._send_encoded(raw_text.encode(ENCODING) + _ENCODED_LINE_ENDINGS)
 
-                self._set_timeout(SEND_TIMEOUT)
+        else:
+            error_message = 'Send failed: Connection has not been established.'
+            tools.println(error_message, tools.SEVERITY['ERROR'])
+            raise SocketConnectionNotEstablished(error_message)
 
-                # NOTE: This loop wrapping send() ensures the socket actually sends the whole message
-                while bytes_sent < msg_len:
-                    try:
-                        num_bytes = self._socket.send(encoded_msg[bytes_sent:])
-
-                    except socket.timeout:
-                        error_message = 'Send failed: Operation timed out after {} second(s).'.format(SEND_TIMEOUT)
-                        tools.println(error_message, tools.SEVERITY['ERROR'])
-                        raise SocketTimeout(error_message)
-
-                    except socket.error as err:
-                        error_message = 'Send failed: {}'.format(err)
-                        tools.println(error_message, tools.SEVERITY['ERROR'])
-                        self._is_connected = False  # self.disconnect()
-                        raise SocketConnectionBroken(error_message)
-
-                    else:
-                        # NOTE: If send() works but returns 0 bytes, it means the connection was terminated
-                        if num_bytes == 0:
-                            error_message = 'Send failed: Connection was closed unexpectedly.'
-                            tools.println(error_message, tools.SEVERITY['ERROR'])
-                            self._is_connected = False  # self.disconnect()
-                            raise SocketConnectionBroken(error_message)
+    def send_many(self, lines):
+        """Encode and send several strings to the IRC server with a single send operation.
+
+        Args:
+            lines -- The strings to be sent, one IRC message each. Empty strings are skipped.
+
+        Raises:
+            SocketTimeout
+            SocketConnectionBroken
+            SocketConnectionNotEstablished
+        """
+        if self.is_connected():
+            lines = [line for line in lines if line != '']
+
+            if lines:
+                encoded_msg = _ENCODED_LINE_ENDINGS.join(line.encode(ENCODING) for line in lines) + _ENCODED_LINE_ENDINGS
+                self._send_encoded(encoded_msg)
+
+        else:
+            error_message = 'Send failed: Connection has not been established.'
+            tools.println(error_message, tools.SEVERITY['ERROR'])
+            raise SocketConnectionNotEstablished(error_message)
+
+    def queue_raw_text(self, raw_text):
+        """Encode a string and queue it to be sent to the IRC server along with other messages.
 
-                        bytes_sent += num_bytes
+        Queued messages are sent together in a single send operation once SEND_COALESCE_BYTES are waiting, when flush()
+        is called, or ahead of the next message sent by send_raw_text() or send_many(). There is no timer, so the thread
+        that queues a burst of messages should call flush() once it is done queuing.
 
-                tools.println('>> SENT / {} Bytes: {}'.format(bytes_sent, raw_text), tools.SEVERITY['DEBUG'], DEBUG_MODE)
+        Args:
+            raw_text -- The string to be queued. If it is an empty string, then this method will do nothing.
+
+        Raises:
+            SocketTimeout
+            SocketConnectionBroken
+            SocketConnectionNotEstablished
+        """
+        if not raw_text:
+            return
+
+        if self.is_connected():
+            encoded_msg = raw_text.encode(ENCODING) + _ENCODED_LINE_ENDINGS
+
+            with self._send_lock:
+                self._send_queue.append(encoded_msg)
+                self._send_queue_bytes += len(encoded_msg)
+
+                if self._send_queue_bytes >= SEND_COALESCE_BYTES:
+                    self._send_encoded(b'')
 
         else:
             error_message = 'Send failed: Connection has not been established.'
             tools.println(error_message, tools.SEVERITY['ERROR'])
             raise SocketConnectionNotEstablished(error_message)
 
+    def flush(self):
+        """Send any messages queued by queue_raw_text() to the IRC server right away.
+
+        Raises:
+            SocketTimeout
+            SocketConnectionBroken
+            SocketConnectionNotEstablished
+        """
+        if self._send_queue:
+            if self.is_connected():
+                self._send_encoded(b'')
+
+            else:
+                error_message = 'Send failed: Connection has not been established.'
+                tools.println(error_message, tools.SEVERITY['ERROR'])
+                raise SocketConnectionNotEstablished(error_message)
+
+    def _send_encoded(self, encoded_msg):
+        """Send already-encoded data to the IRC server.
+
+        Any queued messages are sent first, in the same send operation. If the send times out, whatever has not been sent
+        yet is put back in the queue, so it goes out ahead of the next message instead of being lost or cut short. The
+        whole operation holds _send_lock, so messages from different threads are never interleaved.
+
+        Args:
+            encoded_msg -- The bytes to be sent, including line endings. May be empty to only send the queued messages.
+
+        Raises:
+            SocketTimeout
+            SocketConnectionBroken
+        """
+        with self._send_lock:
+            if self._send_queue:
+                if encoded_msg:
+                    self._send_queue.append(encoded_msg)
+
+                frames = self._send_queue
+                self._send_queue = []
+                self._send_queue_bytes = 0
+
+            elif encoded_msg:
+                frames = [encoded_msg]
+
+            else:
+                # NOTE: Another thread already sent the queued messages this call was meant to flush
+                return
+
+            if len(frames) > 1 and not _HAS_SENDMSG:
+                frames = [b''.join(frames)]
+
+            try:
+                self._send_frames(frames)
+
+            except socket.timeout as err:
+                error_message = _SEND_TIMEOUT_MESSAGE
+                tools.println(error_message, tools.SEVERITY['ERROR'])
+                raise SocketTimeout(error_message) from err
+
+            except socket.error as err:
+                error_message = 'Send failed: {}'.format(err)
+                tools.println(error_message, tools.SEVERITY['ERROR'])
+                self._is_connected = False  # self.disconnect()
+                raise SocketConnectionBroken(error_message) from err
+
+        if _log.isEnabledFor(logging.DEBUG):
+            encoded_msg = b''.join(frames)
+            raw_text = encoded_msg[:-len(_ENCODED_LINE_ENDINGS)].decode(ENCODING, 'replace')
+            _log.debug('>> SENT / %s Bytes: %s', len(encoded_msg), raw_text)
+
+    def _send_frames(self, frames):
+        """Send encoded messages on the non-blocking socket, in order, until all of them have gone out.
+
+        A single message is sent with send(). Several messages are sent with scatter-gather sendmsg() calls, so they never
+        have to be joined. The selector is only waited on when the kernel's send buffer is full, and SEND_TIMEOUT limits
+        the whole call rather than each wait, so a peer that only accepts a few bytes at a time cannot stretch it out.
+        Must be called with _send_lock held, since unsent data is put back in _send_queue on a timeout.
+
+        Args:
+            frames -- The encoded messages to be sent, in order. Must be a single message if sendmsg() is unavailable.
+
+        Raises:
+            socket.timeout
+            socket.error
+        """
+        # NOTE: IRC messages are far smaller than the kernel's send buffer, so a single message nearly always goes out in
+        # one send() and the loop below is skipped. Only a partial write or a full send buffer falls through to it.
+        if len(frames) == 1:
+            try:
+                num_bytes = self._socket.send(frames[0])
+
+            except BlockingIOError:
+                pass
+
+            else:
+                if num_bytes == len(frames[0]):
+                    return
+
+                if num_bytes == 0:
+                    raise socket.error('Connection was closed unexpectedly.')
+
+                frames = [memoryview(frames[0])[num_bytes:]]
+
+        views = [memoryview(frame) for frame in frames]
+        first = 0
+        deadline = None
+
+        while first < len(views):
+            try:
+                if len(views) - first == 1:
+                    num_bytes = self._socket.send(views[first])
+                else:
+                    num_bytes = self._socket.sendmsg(views[first:first + _MAX_SENDMSG_BUFFERS])
+
+            except BlockingIOError:
+                # NOTE: The deadline is only set once the send first has to wait, so the fast path never reads the clock
+                if deadline is None:
+                    deadline = time.monotonic() + SEND_TIMEOUT
+
+                try:
+                    self._wait_for(self._send_selector, max(deadline - time.monotonic(), 0))
+
+                except socket.timeout:
+                    # NOTE: The connection is still up, so keep the unsent data (including the end of a partially sent
+                    # message) queued for the next send rather than dropping it
+                    unsent = [bytes(view) for view in views[first:]]
+                    self._send_queue[:0] = unsent
+                    self._send_queue_bytes += sum(len(frame) for frame in unsent)
+                    raise
+
+                continue
+
+            # NOTE: If send() works but returns 0 bytes, it means the connection was terminated
+            if num_bytes == 0:
+                raise socket.error('Connection was closed unexpectedly.')
+
+            # NOTE: Skip past the frames that went out completely, and keep the unsent end of a partially sent one
+            while first < len(views) and num_bytes >= len(views[first]):
+                num_bytes -= len(views[first])
+                first += 1
+
+            if num_bytes:
+                views[first] = views[first][num_bytes:]
+
     def recv_raw_text(self):
         """Receive and decode data from the IRC server. The decoding method is the value of ENCODING.
 
+        Only complete lines are returned. A partial line at the end of the received data is kept in the receive buffer
+        and completed by the next call. A partial line longer than MAX_RECV_BYTES breaks the connection.
+
         Raises:
             SocketTimeout
             SocketConnectionBroken
             SocketConnectionNotEstablished
 
         Returns:
-            list -- The lines of text received from the IRC server.
+            list -- The lines of text received from the IRC server (empty if no line has been completed yet).
         """
-        if self.is_connected():
-            self._set_timeout(RECV_TIMEOUT)
+        return self._recv_lines(True)
+
+    def recv_raw_lines(self):
+        """Receive data from the IRC server without decoding it.
+
+        Works like recv_raw_text(), but the lines are left as bytes so they can be inspected or discarded without paying
+        for a decode. Use decode_line() on the ones that need to be displayed or logged.
 
+        Raises:
+            SocketTimeout
+            SocketConnectionBroken
+            SocketConnectionNotEstablished
+
+        Returns:
+            list -- The lines received from the IRC server as bytes (empty if no line has been completed yet).
+        """
+        return self._recv_lines(False)
+
+    @staticmethod
+    def decode_line(line):
+        """Decode a line returned by recv_raw_lines(). The decoding method is the value of ENCODING.
+
+        Args:
+            line -- The line to decode. Bytes that are not valid in ENCODING are handled as set by DECODING_ERRORS.
+
+        Returns:
+            str -- The decoded line.
+        """
+        return str(line, ENCODING, DECODING_ERRORS)
+
+    def _recv_lines(self, decode):
+        """Receive data from the IRC server, answer any PINGs, and split off the complete lines.
+
+        Args:
+            decode -- True to return the lines decoded as str, False to return them as bytes.
+
+        Raises:
+            SocketTimeout
+            SocketConnectionBroken
+            SocketConnectionNotEstablished
+
+        Returns:
+            list -- The complete lines received from the IRC server.
+        """
+        if self.is_connected():
             try:
-                encoded_msg = self._socket.recv(MAX_RECV_BYTES)
+                while True:
+                    try:
+                        bytes_recd = self._socket.recv_into(self._recv_view, MAX_RECV_BYTES)
+                        break
+
+                    except BlockingIOError:
+                        self._wait_for(self._recv_selector, RECV_TIMEOUT)
 
-            except socket.timeout:
-                error_message = 'Receive failed: Operation timed out after {} second(s).'.format(RECV_TIMEOUT)
+            except socket.timeout as err:
+                error_message = _RECV_TIMEOUT_MESSAGE
                 tools.println(error_message, tools.SEVERITY['ERROR'])
-                raise SocketTimeout(error_message)
+                raise SocketTimeout(error_message) from err
 
             except socket.error as err:
                 error_message = 'Receive failed: {}'.format(err)
                 tools.println(error_message, tools.SEVERITY['ERROR'])
                 self._is_connected = False  # self.disconnect()
-                raise SocketConnectionBroken(error_message)
+                raise SocketConnectionBroken(error_message) from err
 
             else:
                 # NOTE: If recv() works but returns a 0-byte message, it means the connection was terminated
-                if encoded_msg == b'':
+                if bytes_recd == 0:
                     error_message = 'Receive failed: Connection was closed unexpectedly.'
                     tools.println(error_message, tools.SEVERITY['ERROR'])
                     self._is_connected = False  # self.disconnect()
                     raise SocketConnectionBroken(error_message)
 
                 else:
-                    bytes_recd = len(encoded_msg)
+                    old_len = len(self._recv_buf)
+                    self._recv_buf += self._recv_view[:bytes_recd]
+
+                    # NOTE: Lines can be split across recv() calls, so only the data up to the last line ending is used.
+                    # Whatever was already buffered holds no line ending, so only the new data (plus the byte before
+                    # it, in case a CRLF was split) needs to be searched.
+                    end = self._recv_buf.rfind(_ENCODED_LINE_ENDINGS, max(old_len - 1, 0))
+
+                    if end < 0:
+                        # NOTE: A server that never ends its line would otherwise make the buffer grow without limit
+                        if len(self._recv_buf) > MAX_RECV_BYTES:
+                            error_message = _LINE_TOO_LONG_MESSAGE
+                            tools.println(error_message, tools.SEVERITY['ERROR'])
+                            self._is_connected = False  # self.disconnect()
+                            raise SocketConnectionBroken(error_message)
 
-                    raw_text = encoded_msg.decode(ENCODING)
+                        return []
 
-                    if raw_text[-(len(LINE_ENDINGS)):] == LINE_ENDINGS:
-                        raw_text = raw_text[:-(len(LINE_ENDINGS))]
+                    # NOTE: The complete lines are read through a view of the buffer instead of being copied out of it
+                    with memoryview(self._recv_buf)[:end] as complete_msg:
+                        pings = [match.group(1) for match in _PING_PATTERN.finditer(complete_msg)]
 
-                    tools.println('<< RECV / {} Bytes: {}'.format(bytes_recd, raw_text), tools.SEVERITY['DEBUG'], DEBUG_MODE)
+                        if decode:
+                            raw_text = str(complete_msg, ENCODING, DECODING_ERRORS)
+                            recvd_lines = raw_text.split(LINE_ENDINGS)
+                        else:
+                            recvd_lines = complete_msg.tobytes().split(_ENCODED_LINE_ENDINGS)
 
-                    recvd_lines = raw_text.split(LINE_ENDINGS)
+                            if _log.isEnabledFor(logging.DEBUG):
+                                raw_text = str(complete_msg, ENCODING, DECODING_ERRORS)
+
+                    del self._recv_buf[:end + len(_ENCODED_LINE_ENDINGS)]
+
+                    if _log.isEnabledFor(logging.DEBUG):
+                        _log.debug('<< RECV / %s Bytes: %s', bytes_recd, raw_text)
 
                     # TODO: Responding to PING messages should probably be the responsibility of the caller?
                     # -
-                    for line in recvd_lines:
-                        # NOTE: We have to echo the server's "PING <a string>" messages with "PONG <same string>"
-                        if line.startswith('PING'):
-                            try:
-                                self.send_raw_text('PONG {}'.format(line.split()[1]))
-                            except SocketTimeout:
-                                raise
-                            except SocketConnectionBroken:
-                                raise
-                            except SocketConnectionNotEstablished:
-                                raise
+                    # NOTE: We have to echo the server's "PING <a string>" messages with "PONG <same string>"
+                    for token in pings:
+                        self._send_encoded(b'PONG ' + token + _ENCODED_LINE_ENDINGS)
                     # -
                     # END TODO
 
@@ -243,15 +570,64 @@ class IrcSocket:
         """
         return self._is_connected
 
+    @staticmethod
+    def _create_socket():
+        """Create a TCP socket tuned for IRC traffic.
+
+        Nagle's algorithm is disabled since IRC messages are small and latency-sensitive, the kernel buffers are
+        enlarged, and keepalive probes are enabled so a dead connection is noticed well before RECV_TIMEOUT runs out.
+
+        Returns:
+            socket -- The new, unconnected socket.
+        """
+        new_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+
+        try:
+            new_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            new_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RECV_BUFFER_SIZE)
+            new_socket.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SEND_BUFFER_SIZE)
+            new_socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+            # NOTE: TCP_KEEPIDLE, TCP_KEEPINTVL and TCP_KEEPCNT are not available on every platform
+            if hasattr(socket, 'TCP_KEEPIDLE') and hasattr(socket, 'TCP_KEEPINTVL'):
+                new_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, KEEPALIVE_IDLE)
+                new_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, KEEPALIVE_INTERVAL)
+
+            # NOTE: Without this the OS default applies (9 probes on Linux), and 60 + 9 * 15 seconds is longer than
+            # RECV_TIMEOUT -- with 4 probes a dead connection is dropped after 60 + 4 * 15 = 120 seconds
+            if hasattr(socket, 'TCP_KEEPCNT'):
+                new_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, KEEPALIVE_COUNT)
+
+        except socket.error as err:
+            tools.println('Could not set socket options: {}'.format(err), tools.SEVERITY['WARN'])
+
+        return new_socket
+
+    @staticmethod
+    def _wait_for(selector, timeout):
+        """Wait until one of the socket's selectors is ready.
+
+        Args:
+            selector -- _recv_selector to wait until data can be received, or _send_selector to wait until it can be sent.
+            timeout -- The most seconds to wait before giving up.
+
+        Raises:
+            socket.timeout
+        """
+        if not selector.select(timeout):
+            raise socket.timeout('timed out')
+
     def _set_timeout(self, new_timeout):
         """Set the socket object's timeout in seconds.
 
         Args:
             new_timeout -- The new timeout to be used in seconds (can be represented as a float or int)
         """
-        if float(new_timeout) != self._socket.gettimeout():
-            tools.println('Timeout set to {} second(s).'.format(new_timeout), tools.SEVERITY['DEBUG'], DEBUG_MODE)
+        # NOTE: The last value set is remembered so the socket is only touched when the timeout actually changes
+        if new_timeout != self._current_timeout:
+            _log.debug('Timeout set to %s second(s).', new_timeout)
             self._socket.settimeout(new_timeout)
+            self._current_timeout = new_timeout
 
 
 class SocketError(OSError):
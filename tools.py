@@ -1,7 +1,8 @@
 #!/usr/bin/env python
-import inspect
+import logging
 import os.path
-from datetime import datetime
+import sys
+import time
 
 SEVERITY = {
     'DEBUG': 'DEBUG',
@@ -11,6 +12,44 @@ SEVERITY = {
     'FATAL': 'FATAL'
 }
 
+LOG_FORMAT = '[%(asctime)s] [%(filename)s] [%(levelname)s] %(message)s'  # logging format matching println()
+LOG_DATE_FORMAT = '%H:%M:%S'  # logging timestamp format matching println()
+
+_DEBUG = SEVERITY['DEBUG']  # Looked up once, since println() compares against it on every call
+_basenames = {}  # Caches os.path.basename() of each caller's filename
+
+# NOTE: The timestamp only has one-second resolution, so it is rebuilt once per second instead of once per message
+_ts_second = None
+_ts_str = ''
+
+
+def _now_hms():
+    """Return the current local time as an 'HH:MM:SS' string, reusing the last one if the second has not changed.
+
+    Returns:
+        str -- The current local time.
+    """
+    global _ts_second, _ts_str
+
+    second = int(time.time())
+
+    if second != _ts_second:
+        _ts_second = second
+        _ts_str = time.strftime('%H:%M:%S', time.localtime(second))
+
+    return _ts_str
+
+
+def make_log_handler():
+    """Create a logging handler that prints records to stdout in the same format as println().
+
+    Returns:
+        logging.StreamHandler -- The new handler.
+    """
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT, LOG_DATE_FORMAT))
+    return handler
+
 
 def println(message, severity=SEVERITY['INFO'], debug_mode=False):
     """Custom print based on message severity.
@@ -20,10 +59,22 @@ def println(message, severity=SEVERITY['INFO'], debug_mode=False):
         severity -- Severity level of the message. 'DEBUG' severity only prints if debug_mode=True. (Default = 'INFO')
         debug_mode -- Suppresses or allows printing of messages with 'DEBUG' severity. (Default = False)
     """
-    fname = os.path.basename(inspect.stack()[1].filename)
-    timestamp = datetime.now().strftime('%H:%M:%S')
+    # NOTE: Suppressed messages return before the caller's filename and the timestamp are looked up
+    if severity == _DEBUG and debug_mode == False:
+        return
+
+    # NOTE: sys._getframe() only fetches the caller's frame, where inspect.stack() would build a record for every frame
+    filename = sys._getframe(1).f_code.co_filename
+    fname = _basenames.get(filename)
+
+    if fname is None:
+        fname = _basenames[filename] = os.path.basename(filename)
+
+    timestamp = _now_hms()
+
+    # NOTE: One write of the complete line, instead of print() writing the message and the newline separately
+    # -- like print(), do nothing when there is no stdout (e.g. the GUI running under pythonw)
+    out = sys.stdout
 
-    if severity == SEVERITY['DEBUG'] and debug_mode == False:
-        pass
-    else:
-        print('[{}] [{}] [{}] {}'.format(timestamp, fname, severity, message))
+    if out is not None:
+        out.write('[{}] [{}] [{}] {}\n'.format(timestamp, fname, severity, message))